@@ -0,0 +1,339 @@
+FALSE = 0
+TRUE = 1
+
+# The kinds of the items on the stack of the operation evaluation
+_CALL = 0
+_MK = 1
+_OR = 2
+_STORE = 3
+_AND_EXISTS_HIGH = 4
+
+
+class BDD:
+    """
+    A manager of reduced ordered binary decision diagrams.
+    Nodes are represented by integers, the terminals are FALSE and TRUE,
+    and variables are ordered by their indices.
+    Nodes are kept unique by the unique table and results of the operations are memoized in the computed table.
+    """
+    def __init__(self, num_vars, cache_limit=1000000):
+        """
+        Initialize a new manager.
+        :param num_vars: the number of the boolean variables
+        :param cache_limit: the number of entries after which the computed table is cleared
+        """
+        self.num_vars = num_vars
+        self.cache_limit = cache_limit
+        self._var = [num_vars, num_vars]
+        self._low = [FALSE, TRUE]
+        self._high = [FALSE, TRUE]
+        self._unique = {}
+        self._cache = {}
+
+    def mk(self, var, low, high):
+        """
+        Get the node testing the given variable, creating it if it does not exist yet.
+        :param var: the tested variable, it must precede the variables of both children
+        :param low: the node for the variable being false
+        :param high: the node for the variable being true
+        :return: the node
+        """
+        if low == high:
+            return low
+        key = (var, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = len(self._var)
+            self._var.append(var)
+            self._low.append(low)
+            self._high.append(high)
+            self._unique[key] = node
+        return node
+
+    def cube(self, assignment):
+        """
+        Construct the conjunction of literals.
+        :param assignment: an iterable of variable, value pairs
+        :return: the node satisfied exactly by the extensions of the assignment
+        """
+        u = TRUE
+        for var, value in sorted(assignment, reverse=True):
+            if value:
+                u = self.mk(var, FALSE, u)
+            else:
+                u = self.mk(var, u, FALSE)
+        return u
+
+    def _store(self, key, r):
+        if len(self._cache) >= self.cache_limit:
+            self._cache.clear()
+        self._cache[key] = r
+
+    def _cofactors(self, u, var):
+        if self._var[u] == var:
+            return self._low[u], self._high[u]
+        return u, u
+
+    def _evaluate(self, op, args):
+        """
+        Evaluate the operation with an explicit stack instead of recursion,
+        so the depth of the diagrams is not limited by the Python recursion limit.
+        :param op: the name of the operation
+        :param args: the arguments of the operation
+        :return: the resulting node
+        """
+        results = []
+        stack = [(_CALL, op, args)]
+        while stack:
+            item = stack.pop()
+            kind = item[0]
+            if kind == _CALL:
+                self._expand(item[1], item[2], stack, results)
+            elif kind == _MK:
+                r1 = results.pop()
+                r0 = results.pop()
+                r = self.mk(item[2], r0, r1)
+                self._store(item[1], r)
+                results.append(r)
+            elif kind == _OR:
+                r1 = results.pop()
+                r0 = results.pop()
+                stack.append((_STORE, item[1]))
+                stack.append((_CALL, 'or', (r0, r1)))
+            elif kind == _STORE:
+                self._store(item[1], results[-1])
+            elif kind == _AND_EXISTS_HIGH:
+                # The high cofactor does not need to be computed once the low one is TRUE
+                _, key, u1, v1, rest = item
+                if results[-1] == TRUE:
+                    self._store(key, TRUE)
+                else:
+                    stack.append((_OR, key))
+                    stack.append((_CALL, 'and_exists', (u1, v1, rest)))
+        return results.pop()
+
+    def _expand(self, op, args, stack, results):
+        """
+        Resolve the terminal cases and the computed table hits of the operation,
+        otherwise schedule the operations on the cofactors followed by their combination.
+        """
+        if op == 'not':
+            u, = args
+            if u <= TRUE:
+                results.append(TRUE - u)
+                return
+            key = ('not', u)
+            r = self._cache.get(key)
+            if r is not None:
+                results.append(r)
+                return
+            stack.append((_MK, key, self._var[u]))
+            stack.append((_CALL, 'not', (self._high[u],)))
+            stack.append((_CALL, 'not', (self._low[u],)))
+        elif op == 'and' or op == 'or' or op == 'diff':
+            u, v = args
+            r = self._binary_terminal(op, u, v)
+            if r is not None:
+                results.append(r)
+                return
+            if op == 'diff' and u == TRUE:
+                stack.append((_CALL, 'not', (v,)))
+                return
+            if op != 'diff' and u > v:
+                u, v = v, u
+            key = (op, u, v)
+            r = self._cache.get(key)
+            if r is not None:
+                results.append(r)
+                return
+            var = min(self._var[u], self._var[v])
+            u0, u1 = self._cofactors(u, var)
+            v0, v1 = self._cofactors(v, var)
+            stack.append((_MK, key, var))
+            stack.append((_CALL, op, (u1, v1)))
+            stack.append((_CALL, op, (u0, v0)))
+        elif op == 'exists':
+            u, variables = args
+            while variables != TRUE and self._var[variables] < self._var[u]:
+                variables = self._high[variables]
+            if u <= TRUE or variables == TRUE:
+                results.append(u)
+                return
+            key = ('exists', u, variables)
+            r = self._cache.get(key)
+            if r is not None:
+                results.append(r)
+                return
+            var = self._var[u]
+            if var == self._var[variables]:
+                rest = self._high[variables]
+                stack.append((_OR, key))
+                stack.append((_CALL, 'exists', (self._high[u], rest)))
+                stack.append((_CALL, 'exists', (self._low[u], rest)))
+            else:
+                stack.append((_MK, key, var))
+                stack.append((_CALL, 'exists', (self._high[u], variables)))
+                stack.append((_CALL, 'exists', (self._low[u], variables)))
+        elif op == 'and_exists':
+            u, v, variables = args
+            if u == FALSE or v == FALSE:
+                results.append(FALSE)
+                return
+            if u == TRUE and v == TRUE:
+                results.append(TRUE)
+                return
+            if u == TRUE or u == v:
+                stack.append((_CALL, 'exists', (v, variables)))
+                return
+            if v == TRUE:
+                stack.append((_CALL, 'exists', (u, variables)))
+                return
+            var = min(self._var[u], self._var[v])
+            while variables != TRUE and self._var[variables] < var:
+                variables = self._high[variables]
+            if variables == TRUE:
+                stack.append((_CALL, 'and', (u, v)))
+                return
+            if u > v:
+                u, v = v, u
+            key = ('and_exists', u, v, variables)
+            r = self._cache.get(key)
+            if r is not None:
+                results.append(r)
+                return
+            u0, u1 = self._cofactors(u, var)
+            v0, v1 = self._cofactors(v, var)
+            if var == self._var[variables]:
+                rest = self._high[variables]
+                stack.append((_AND_EXISTS_HIGH, key, u1, v1, rest))
+                stack.append((_CALL, 'and_exists', (u0, v0, rest)))
+            else:
+                stack.append((_MK, key, var))
+                stack.append((_CALL, 'and_exists', (u1, v1, variables)))
+                stack.append((_CALL, 'and_exists', (u0, v0, variables)))
+        elif op == 'rename':
+            u, mapping, var_map = args
+            if u <= TRUE:
+                results.append(u)
+                return
+            key = ('rename', mapping, u)
+            r = self._cache.get(key)
+            if r is not None:
+                results.append(r)
+                return
+            var = self._var[u]
+            stack.append((_MK, key, var_map.get(var, var)))
+            stack.append((_CALL, 'rename', (self._high[u], mapping, var_map)))
+            stack.append((_CALL, 'rename', (self._low[u], mapping, var_map)))
+        else:
+            assert False, 'unreachable'
+
+    @staticmethod
+    def _binary_terminal(op, u, v):
+        if op == 'and':
+            if u == FALSE or v == FALSE:
+                return FALSE
+            if u == TRUE or u == v:
+                return v
+            if v == TRUE:
+                return u
+        elif op == 'or':
+            if u == TRUE or v == TRUE:
+                return TRUE
+            if u == FALSE or u == v:
+                return v
+            if v == FALSE:
+                return u
+        else:
+            if u == FALSE or v == TRUE or u == v:
+                return FALSE
+            if v == FALSE:
+                return u
+        return None
+
+    def apply_not(self, u):
+        """
+        :return: the negation of the node
+        """
+        return self._evaluate('not', (u,))
+
+    def apply_and(self, u, v):
+        """
+        :return: the conjunction of the two nodes
+        """
+        return self._evaluate('and', (u, v))
+
+    def apply_or(self, u, v):
+        """
+        :return: the disjunction of the two nodes
+        """
+        return self._evaluate('or', (u, v))
+
+    def apply_diff(self, u, v):
+        """
+        :return: the conjunction of the first node and the negation of the second node
+        """
+        return self._evaluate('diff', (u, v))
+
+    def exists(self, u, variables):
+        """
+        Existentially quantify the variables.
+        :param u: the node
+        :param variables: the node of the positive cube of the quantified variables
+        :return: the quantified node
+        """
+        return self._evaluate('exists', (u, variables))
+
+    def and_exists(self, u, v, variables):
+        """
+        Compute the relational product, i.e. the conjunction of the nodes with the variables quantified,
+        without constructing the whole conjunction.
+        :param u: the first node
+        :param v: the second node
+        :param variables: the node of the positive cube of the quantified variables
+        :return: the quantified conjunction
+        """
+        return self._evaluate('and_exists', (u, v, variables))
+
+    def rename(self, u, mapping):
+        """
+        Rename the variables of the node.
+        The renaming must preserve the relative order of the variables occurring in the node.
+        :param u: the node
+        :param mapping: a tuple of old variable, new variable pairs
+        :return: the renamed node
+        """
+        return self._evaluate('rename', (u, mapping, dict(mapping)))
+
+    def pick_assignment(self, u):
+        """
+        Pick one satisfying assignment of the node.
+        :param u: the node, it must not be FALSE
+        :return: a dict mapping the variables on the chosen path to their values
+        """
+        assert u != FALSE
+        assignment = {}
+        while u != TRUE:
+            if self._low[u] != FALSE:
+                assignment[self._var[u]] = False
+                u = self._low[u]
+            else:
+                assignment[self._var[u]] = True
+                u = self._high[u]
+        return assignment
+
+    def node_count(self, u):
+        """
+        :return: the number of nodes reachable from the node, including terminals
+        """
+        visited = set()
+        stack = [u]
+        while stack:
+            w = stack.pop()
+            if w in visited:
+                continue
+            visited.add(w)
+            if w > TRUE:
+                stack.append(self._low[w])
+                stack.append(self._high[w])
+        return len(visited)
@@ -67,6 +67,41 @@ def construct_action_landmark(edges, rev_edges):
     return landmark
 
 
+def is_action_landmark(actions, s0, g, pre_to_actions, landmark):
+    """
+    Check whether every relaxed plan from the given state uses at least one of the actions.
+    :param actions: the delete relaxed actions
+    :param s0: the state
+    :param g: the goal
+    :param pre_to_actions: a dict mapping facts to the indices of actions having them in the precondition
+    :param landmark: the indices of the actions
+    :return: true only if the goal is not relaxed reachable without the actions
+    """
+    excluded = set(landmark)
+    counter = [len(pre) for pre, add, cost in actions]
+    reached = set(s0)
+    stack = list(s0)
+    for i, (pre, add, cost) in enumerate(actions):
+        if not pre and i not in excluded:
+            for q in add:
+                if q not in reached:
+                    reached.add(q)
+                    stack.append(q)
+
+    while stack:
+        p = stack.pop()
+        for i in pre_to_actions[p]:
+            counter[i] -= 1
+            if counter[i] == 0 and i not in excluded:
+                pre, add, cost = actions[i]
+                for q in add:
+                    if q not in reached:
+                        reached.add(q)
+                        stack.append(q)
+
+    return not g.issubset(reached)
+
+
 def compute_h_lm_cut(
         facts,
         actions,
@@ -74,6 +109,31 @@ def compute_h_lm_cut(
         g,
         pre_to_actions
 ):
+    h_lm_cut, landmarks = compute_h_lm_cut_landmarks(facts, actions, s0, g, pre_to_actions)
+    return h_lm_cut
+
+
+def compute_h_lm_cut_landmarks(
+        facts,
+        actions,
+        s0,
+        g,
+        pre_to_actions,
+        parent_landmarks=()
+):
+    """
+    Compute the LM-cut heuristic together with the found landmarks.
+    The landmarks of the parent state which are still landmarks in s0 are applied with their costs
+    before the cut loop, which then only runs on the remaining action costs.
+    As the landmarks and costs come from a single cost partitioning of the parent, the heuristic stays admissible.
+    :param facts: the facts of the delete relaxed task
+    :param actions: the delete relaxed actions
+    :param s0: the evaluated state
+    :param g: the goal
+    :param pre_to_actions: a dict mapping facts to the indices of actions having them in the precondition
+    :param parent_landmarks: the landmark, cost pairs computed in the parent state
+    :return: the heuristic value and the list of landmark, cost pairs of s0
+    """
     init_g = g
     actions = actions + [
         ({False}, s0, 0),
@@ -88,13 +148,25 @@ def compute_h_lm_cut(
     g = {True}
 
     h_lm_cut = 0
+    landmarks = []
+    for landmark, m in parent_landmarks:
+        if not is_action_landmark(actions, s0, g, pre_to_actions, landmark):
+            continue
+        landmarks.append((landmark, m))
+        h_lm_cut += m
+        for i in landmark:
+            pre, add, cost = actions[i]
+            actions[i] = (pre, add, cost - m)
+
     sigma = hmax.compute_gamma_fixed_point(facts, actions, s0, g, True, pre_to_actions)
 
     max_cost = sigma[True]
     if max_cost == float('inf'):
-        return float('inf')
-
-    pcf = compute_pcf(actions, sigma)
+        h_lm_cut = float('inf')
+        landmarks = []
+        max_cost = 0
+    else:
+        pcf = compute_pcf(actions, sigma)
 
     while max_cost != 0:
         # Construct justification graph
@@ -112,6 +184,7 @@ def compute_h_lm_cut(
         if m == 0:
             break
         h_lm_cut += m
+        landmarks.append((landmark, m))
 
         # Lower costs of actions in landmark by m
         for i in landmark:
@@ -127,7 +200,7 @@ def compute_h_lm_cut(
     for p in init_g:
         pre_to_actions[p] = pre_to_actions[p][:-1]
 
-    return h_lm_cut
+    return h_lm_cut, landmarks
 
 
 def main(args: argparse.Namespace):
@@ -1,11 +1,12 @@
 #!/bin/env python
 import argparse
+import heapq
 from argparse import ArgumentParser
 from enum import Enum
 
 from sas import SasParser, fdr_to_strips_plus
 from hmax import compute_h_max
-from lmcut import compute_h_lm_cut
+from lmcut import compute_h_lm_cut, compute_h_lm_cut_landmarks
 from dataclasses import dataclass
 
 
@@ -27,18 +28,21 @@ def get_path(parent, goal_state):
     return actions[::-1], total_cost
 
 
-def a_star(s0, is_goal, get_applicable, h):
+def a_star(s0, is_goal, get_applicable, h, weight=1):
     """
     An implementation of the classic A* search algorithm.
+    With a weight greater than 1 this becomes weighted A* ordering states by f = g + weight * h,
+    which finds plans at most weight times more expensive than the optimal one.
     :param s0: the initial state
     :param is_goal: a function returning true only if the given state is goal
     :param get_applicable: a function returning all applicable actions and neighbors in the given state
     :param h: a heuristic function returning a float indicating the estimated distance to goal from the given state
+    :param weight: the weight of the heuristic value, 1 gives optimal A*
     :return: the found path from the initial state to the goal state and its cost
     """
     parent = {}
     g = {s0: 0}
-    open_list = [(s0, h(s0))]
+    open_list = [(s0, weight * h(s0))]
 
     while open_list:
         min_priority = float('inf')
@@ -57,11 +61,150 @@ def a_star(s0, is_goal, get_applicable, h):
             if v < g.get(s1, float('inf')):
                 g[s1] = v
                 parent[s1] = (s, a, cost)
-                open_list.append((s1, v + h(s1)))
+                open_list.append((s1, v + weight * h(s1)))
 
     return [], -1
 
 
+def greedy_best_first_search(s0, is_goal, get_applicable, h):
+    """
+    Greedy best-first search expanding the state with the lowest heuristic value first.
+    The cost of the found plan is not bounded, but it is usually found much faster than by A*.
+    :param s0: the initial state
+    :param is_goal: a function returning true only if the given state is goal
+    :param get_applicable: a function returning all applicable actions and neighbors in the given state
+    :param h: a heuristic function returning a float indicating the estimated distance to goal from the given state
+    :return: the found path from the initial state to the goal state and its cost
+    """
+    parent = {}
+    closed = {s0}
+    open_list = [(h(s0), s0)]
+
+    while open_list:
+        h_s, s = heapq.heappop(open_list)
+
+        if is_goal(s):
+            return get_path(parent, s)
+
+        for a, cost, s1 in get_applicable(s):
+            if s1 not in closed:
+                closed.add(s1)
+                parent[s1] = (s, a, cost)
+                h_s1 = h(s1)
+                if h_s1 != float('inf'):
+                    heapq.heappush(open_list, (h_s1, s1))
+
+    return [], -1
+
+
+def get_weight_schedule(initial_weight, decrement):
+    """
+    Construct the decreasing sequence of weights used by the anytime search.
+    :param initial_weight: the first weight
+    :param decrement: how much the weight is lowered in every iteration
+    :return: the list of weights ending with 1
+    """
+    assert decrement > 0
+    weights = []
+    k = 0
+    # The weights are not accumulated to avoid a nearly duplicate last iteration caused by rounding errors
+    while initial_weight - k * decrement > 1 + 1e-9:
+        weights.append(initial_weight - k * decrement)
+        k += 1
+    weights.append(1)
+    return weights
+
+
+def anytime_a_star(s0, is_goal, get_applicable, h, weights):
+    """
+    Anytime repairing A* (ARA*) running a sequence of weighted A* searches with decreasing weights.
+    The g values, parents and heuristic values are kept between the iterations,
+    so every iteration only repairs the states whose cost improved during the previous one.
+    The reported bounds are computed from the lowest f = g + h of the states left to repair,
+    so they hold for any admissible heuristic, even an inconsistent one.
+    The last weight is repeated until the plan is proven optimal.
+    :param s0: the initial state
+    :param is_goal: a function returning true only if the given state is goal
+    :param get_applicable: a function returning all applicable actions and neighbors in the given state
+    :param h: a heuristic function returning a float indicating the estimated distance to goal from the given state
+    :param weights: the decreasing sequence of weights, the last one should be 1
+    :return: a generator yielding the path, its cost and the proven suboptimality bound every time it improves
+    """
+    h_cache = {}
+
+    def cached_h(state):
+        if state not in h_cache:
+            h_cache[state] = h(state)
+        return h_cache[state]
+
+    parent = {}
+    g = {s0: 0}
+    best_goal = s0 if is_goal(s0) else None
+    best_cost = 0 if best_goal is not None else float('inf')
+    best_bound = float('inf')
+    reported_cost = float('inf')
+    open_set = {s0}
+    inconsistent = set()
+
+    weights = list(weights)
+    iteration = 0
+    while iteration < len(weights) or inconsistent:
+        weight = weights[min(iteration, len(weights) - 1)]
+        iteration += 1
+        open_set |= inconsistent
+        inconsistent = set()
+        closed = set()
+        open_list = [(g[s] + weight * cached_h(s), g[s], s) for s in open_set]
+        heapq.heapify(open_list)
+
+        while open_list:
+            key, g_s, s = open_list[0]
+            if s not in open_set or g_s != g[s]:
+                heapq.heappop(open_list)
+                continue
+            if best_cost <= key:
+                break
+            heapq.heappop(open_list)
+            open_set.remove(s)
+
+            # States which cannot lead to a cheaper plan are dropped for good
+            if g_s + cached_h(s) >= best_cost:
+                continue
+            closed.add(s)
+
+            for a, cost, s1 in get_applicable(s):
+                v = g_s + cost
+                if v < g.get(s1, float('inf')):
+                    g[s1] = v
+                    parent[s1] = (s, a, cost)
+                    if v < best_cost and is_goal(s1):
+                        best_goal = s1
+                        best_cost = v
+                    if s1 in closed:
+                        inconsistent.add(s1)
+                    else:
+                        open_set.add(s1)
+                        heapq.heappush(open_list, (v + weight * cached_h(s1), v, s1))
+
+        if best_goal is None:
+            continue
+
+        lower_bound = best_cost
+        for s in open_set | inconsistent:
+            lower_bound = min(lower_bound, g[s] + cached_h(s))
+        bound = best_cost / lower_bound if lower_bound > 0 else 1
+        bound = min(bound, best_bound)
+
+        if best_cost < reported_cost or bound < best_bound:
+            reported_cost = best_cost
+            best_bound = bound
+            path, total_cost = get_path(parent, best_goal)
+            yield path, total_cost, bound
+
+        if best_bound <= 1:
+            return
+
+
 @dataclass
 class SelectorNode:
     selection_variable: int
@@ -161,9 +304,23 @@ class HeuristicName(str, Enum):
     LMCUT = 'lmcut'
 
 
+class SearchName(str, Enum):
+    ASTAR = 'astar'
+    ANYTIME = 'anytime'
+    GBFS = 'gbfs'
+
+
+def print_plan(path, total_cost):
+    for action in path:
+        print(action)
+
+    print(f'Plan cost: {total_cost}')
+
+
 def main(args: argparse.Namespace):
     input_file_name = args.input
     heuristic_name = args.heuristic.value
+    search_name = args.search.value
     parser = SasParser(input_file_name)
     num_variables, initial_values, goal_state, actions = parser.parse()
     facts, str_actions, str_initial_state, str_goal_state, pre_to_actions = fdr_to_strips_plus(
@@ -178,8 +335,16 @@ def main(args: argparse.Namespace):
                 return False
         return True
 
+    # The LM-cut landmarks of the evaluated states which were not expanded yet,
+    # and the landmarks of the last expanded state kept while its successors are evaluated
+    landmarks_of = {}
+    expanded = {'successors': set(), 'landmarks': []}
+
     def get_applicable(state):
         applicable1 = successor_generator.get_applicable(state)
+        if args.warm_start:
+            expanded['successors'] = {s1 for a, cost, s1 in applicable1}
+            expanded['landmarks'] = landmarks_of.pop(state, [])
         return applicable1
 
     def h_max_heuristic(state):
@@ -191,22 +356,53 @@ def main(args: argparse.Namespace):
         h_lmcut = compute_h_lm_cut(facts, str_actions, s, str_goal_state, pre_to_actions)
         return h_lmcut
 
+    def h_lm_cut_warm_start_heuristic(state):
+        s = {(var_index, value) for var_index, value in enumerate(state)}
+        parent_landmarks = expanded['landmarks'] if state in expanded['successors'] else []
+        h_lmcut, landmarks_of[state] = compute_h_lm_cut_landmarks(
+            facts, str_actions, s, str_goal_state, pre_to_actions, parent_landmarks
+        )
+        return h_lmcut
+
     if heuristic_name == HeuristicName.HMAX:
-        path, total_cost = a_star(tuple(initial_values), is_goal, get_applicable, h_max_heuristic)
+        h = h_max_heuristic
+    elif heuristic_name == HeuristicName.LMCUT and args.warm_start:
+        h = h_lm_cut_warm_start_heuristic
     elif heuristic_name == HeuristicName.LMCUT:
-        path, total_cost = a_star(tuple(initial_values), is_goal, get_applicable, h_lm_cut_heuristic)
+        h = h_lm_cut_heuristic
     else:
         assert False, 'unreachable'
 
-    for action in path:
-        print(action)
-
-    print(f'Plan cost: {total_cost}')
+    s0 = tuple(initial_values)
+    if search_name == SearchName.ASTAR:
+        path, total_cost = a_star(s0, is_goal, get_applicable, h, args.weight)
+        print_plan(path, total_cost)
+        if total_cost != -1 and args.weight > 1:
+            print(f'Suboptimality bound: {args.weight}')
+    elif search_name == SearchName.GBFS:
+        path, total_cost = greedy_best_first_search(s0, is_goal, get_applicable, h)
+        print_plan(path, total_cost)
+    elif search_name == SearchName.ANYTIME:
+        weights = get_weight_schedule(args.weight, args.weight_decrement)
+        best_cost = None
+        for path, total_cost, bound in anytime_a_star(s0, is_goal, get_applicable, h, weights):
+            # Only the bound is printed when the plan did not improve
+            if best_cost is None or total_cost < best_cost:
+                if best_cost is not None:
+                    print()
+                best_cost = total_cost
+                print_plan(path, total_cost)
+            print(f'Suboptimality bound: {bound}', flush=True)
+        if best_cost is None:
+            print_plan([], -1)
+    else:
+        assert False, 'unreachable'
 
 
 if __name__ == '__main__':
     parser = ArgumentParser(
-        description='Plan an optimal path from the initial state to a goal state using A* and a heuristic'
+        description='Plan a path from the initial state to a goal state using heuristic search, '
+                    'the plan is optimal with the default A* search with weight 1'
     )
     parser.add_argument(
         '--input', '-i', type=str,
@@ -219,4 +415,30 @@ if __name__ == '__main__':
         help='The type of heuristic to use',
         required=True
     )
-    main(parser.parse_args())
+    parser.add_argument(
+        '--warm-start', action='store_true',
+        help='Start the LM-cut computation in every state from the still valid landmarks of its parent'
+    )
+    parser.add_argument(
+        '--search', type=SearchName, default=SearchName.ASTAR,
+        choices=[search_name.value for search_name in SearchName],
+        help='The search algorithm, anytime prints every improved plan as soon as it is found'
+    )
+    parser.add_argument(
+        '--weight', '-w', type=float, default=1,
+        help='The heuristic weight of A*, or the initial weight of the anytime search'
+    )
+    parser.add_argument(
+        '--weight-decrement', type=float, default=1,
+        help='How much the anytime search lowers the weight after each iteration'
+    )
+    args = parser.parse_args()
+    if args.weight < 1:
+        parser.error('--weight must be at least 1')
+    if args.weight_decrement <= 0:
+        parser.error('--weight-decrement must be positive')
+    if args.weight != 1 and args.search == SearchName.GBFS:
+        parser.error('--weight cannot be used with --search gbfs')
+    if args.warm_start and args.heuristic != HeuristicName.LMCUT:
+        parser.error('--warm-start can only be used with --heuristic lmcut')
+    main(args)
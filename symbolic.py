@@ -0,0 +1,326 @@
+#!/bin/env python
+import argparse
+from argparse import ArgumentParser
+from dataclasses import dataclass
+
+from bdd import BDD, FALSE, TRUE
+from sas import SasParser
+
+
+@dataclass
+class TransitionRelation:
+    relation: int
+    cost: int
+    effect_variables: tuple
+    unprimed_cube: int
+    primed_cube: int
+    to_unprimed: tuple
+    to_primed: tuple
+
+
+class SymbolicTask:
+    """
+    The FDR task with sets of states represented by BDDs.
+    Every FDR variable is encoded by the bits of the binary representation of its value,
+    the current state and the next state bits of every variable are interleaved in the variable order.
+    """
+    def __init__(self, num_variables, initial_values, goal_state, actions):
+        """
+        Encode the parsed FDR task.
+        :param num_variables: the number of variables
+        :param initial_values: the initial value of every variable
+        :param goal_state: the list of variable, value pairs of the goal
+        :param actions: the list of action name, cost, prevailing variables and effect variables tuples
+        """
+        max_values = list(initial_values)
+        for var_index, value in goal_state:
+            max_values[var_index] = max(max_values[var_index], value)
+        for name, cost, prevailing, effect in actions:
+            for var_index, value in prevailing:
+                max_values[var_index] = max(max_values[var_index], value)
+            for var_index, changed_from, changed_to in effect:
+                max_values[var_index] = max(max_values[var_index], changed_from, changed_to)
+        self.domains = [max_value + 1 for max_value in max_values]
+
+        self.bits = []
+        num_bits = 0
+        for domain in self.domains:
+            width = max(1, (domain - 1).bit_length())
+            self.bits.append(list(range(num_bits, num_bits + 2 * width, 2)))
+            num_bits += 2 * width
+        self.bdd = BDD(num_bits)
+
+        self.valid = TRUE
+        for var_index, domain in enumerate(self.domains):
+            allowed = FALSE
+            for value in range(domain):
+                allowed = self.bdd.apply_or(allowed, self.value_bdd(var_index, value))
+            self.valid = self.bdd.apply_and(self.valid, allowed)
+
+        self.initial = self.bdd.cube(self._assignment(enumerate(initial_values)))
+        self.goal = self.bdd.apply_and(self.bdd.cube(self._assignment(goal_state)), self.valid)
+
+        self.operators = []
+        for name, cost, prevailing, effect in actions:
+            pre = list(prevailing)
+            pre += [(var_index, changed_from) for var_index, changed_from, changed_to in effect if changed_from != -1]
+            post = [(var_index, changed_to) for var_index, changed_from, changed_to in effect]
+            relation = self.bdd.cube(self._assignment(pre) + self._assignment(post, primed=True))
+            effect_variables = tuple(sorted(var_index for var_index, value in post))
+            self.operators.append((name, self._transition_relation(relation, cost, effect_variables)))
+
+        # Operators with the same cost and the same affected variables share one transition relation
+        grouped = {}
+        for name, transition in self.operators:
+            key = (transition.cost, transition.effect_variables)
+            if key in grouped:
+                relation = self.bdd.apply_or(grouped[key].relation, transition.relation)
+                grouped[key] = self._transition_relation(relation, *key)
+            else:
+                grouped[key] = transition
+        self.transitions = {}
+        for (cost, effect_variables), transition in sorted(grouped.items()):
+            self.transitions.setdefault(cost, []).append(transition)
+
+    def _assignment(self, values, primed=False):
+        assignment = []
+        for var_index, value in values:
+            for i, bit in enumerate(self.bits[var_index]):
+                assignment.append((bit + 1 if primed else bit, bool(value >> i & 1)))
+        return assignment
+
+    def _transition_relation(self, relation, cost, effect_variables):
+        bits = [bit for var_index in effect_variables for bit in self.bits[var_index]]
+        return TransitionRelation(
+            relation, cost, effect_variables,
+            self.bdd.cube((bit, True) for bit in bits),
+            self.bdd.cube((bit + 1, True) for bit in bits),
+            tuple((bit + 1, bit) for bit in bits),
+            tuple((bit, bit + 1) for bit in bits),
+        )
+
+    def value_bdd(self, var_index, value):
+        """
+        :return: the BDD of the states in which the variable has the given value
+        """
+        return self.bdd.cube(self._assignment([(var_index, value)]))
+
+    def image(self, states, transition):
+        """
+        :return: the BDD of the states reached from the given states by the transition relation
+        """
+        successors = self.bdd.and_exists(states, transition.relation, transition.unprimed_cube)
+        return self.bdd.rename(successors, transition.to_unprimed)
+
+    def preimage(self, states, transition):
+        """
+        :return: the BDD of the valid states reaching the given states by the transition relation
+        """
+        primed = self.bdd.rename(states, transition.to_primed)
+        predecessors = self.bdd.and_exists(primed, transition.relation, transition.primed_cube)
+        return self.bdd.apply_and(predecessors, self.valid)
+
+    def pick_state(self, states):
+        """
+        Pick a single state from the set of states.
+        :return: the BDD of the picked state and the decoded values of the variables
+        """
+        assignment = self.bdd.pick_assignment(states)
+        values = []
+        for var_bits in self.bits:
+            values.append(sum(1 << i for i, bit in enumerate(var_bits) if assignment.get(bit, False)))
+        return self.bdd.cube(self._assignment(enumerate(values))), values
+
+
+class SearchDirection:
+    """
+    One direction of the symbolic uniform-cost search.
+    The closed states are stored in layers by their cost,
+    every layer is further split by the number of zero-cost steps needed to reach its states.
+    """
+    def __init__(self, task, start, forward):
+        self.task = task
+        self.forward = forward
+        self.open = {0: start}
+        self.closed = FALSE
+        self.layers = {}
+
+    def _successors(self, states, transition):
+        if self.forward:
+            return self.task.image(states, transition)
+        return self.task.preimage(states, transition)
+
+    def _predecessors(self, states, transition):
+        if self.forward:
+            return self.task.preimage(states, transition)
+        return self.task.image(states, transition)
+
+    def min_g(self):
+        return min(self.open) if self.open else float('inf')
+
+    def next_size(self):
+        return self.task.bdd.node_count(self.open[self.min_g()])
+
+    def expand(self):
+        """
+        Close the cheapest bucket of the open list together with its zero-cost closure and generate its successors.
+        :return: the cost of the bucket, the list of its closed layers and the list of cost, states pairs generated
+        """
+        bdd = self.task.bdd
+        g = self.min_g()
+        states = bdd.apply_diff(self.open.pop(g), self.closed)
+
+        layers = []
+        while states != FALSE:
+            layers.append(states)
+            self.closed = bdd.apply_or(self.closed, states)
+            zero_cost_successors = FALSE
+            for transition in self.task.transitions.get(0, []):
+                zero_cost_successors = bdd.apply_or(zero_cost_successors, self._successors(states, transition))
+            states = bdd.apply_diff(zero_cost_successors, self.closed)
+        if not layers:
+            return g, layers, []
+        self.layers[g] = layers
+
+        expanded = FALSE
+        for states in layers:
+            expanded = bdd.apply_or(expanded, states)
+
+        generated = []
+        for cost, transitions in self.task.transitions.items():
+            if cost == 0:
+                continue
+            successors = FALSE
+            for transition in transitions:
+                successors = bdd.apply_or(successors, self._successors(expanded, transition))
+            successors = bdd.apply_diff(successors, self.closed)
+            if successors != FALSE:
+                self.open[g + cost] = bdd.apply_or(self.open.get(g + cost, FALSE), successors)
+                generated.append((g + cost, successors))
+        return g, layers, generated
+
+    def find_cheapest(self, states):
+        """
+        Find the cheapest of the given states which were reached by this direction.
+        :return: the cost, the zero-cost layer index and the BDD of the found states, or None
+        """
+        bdd = self.task.bdd
+        found = None
+        for g, layers in self.layers.items():
+            for k, layer in enumerate(layers):
+                common = bdd.apply_and(states, layer)
+                if common != FALSE and (found is None or g < found[0]):
+                    found = (g, k, common)
+        for g, bucket in self.open.items():
+            common = bdd.apply_and(states, bucket)
+            if common != FALSE and (found is None or g < found[0]):
+                found = (g, 0, common)
+        return found
+
+    def trace(self, state, g, k):
+        """
+        Reconstruct the operators leading from the start of this direction to the given state.
+        :param state: the BDD of a single state reached by this direction
+        :param g: the cost of the state
+        :param k: the zero-cost layer index of the state, 0 for states in the open list
+        :return: the list of operator names ordered from the given state to the start
+        """
+        bdd = self.task.bdd
+        names = []
+        while g > 0 or k > 0:
+            for name, transition in self.task.operators:
+                if k > 0:
+                    if transition.cost != 0:
+                        continue
+                    target = self.layers[g][k - 1]
+                else:
+                    if transition.cost == 0 or g - transition.cost not in self.layers:
+                        continue
+                    target = FALSE
+                    for layer in self.layers[g - transition.cost]:
+                        target = bdd.apply_or(target, layer)
+                predecessors = bdd.apply_and(self._predecessors(state, transition), target)
+                if predecessors != FALSE:
+                    state, values = self.task.pick_state(predecessors)
+                    names.append(name)
+                    if k > 0:
+                        k -= 1
+                    else:
+                        g -= transition.cost
+                        k = next(i for i, layer in enumerate(self.layers[g]) if bdd.apply_and(state, layer) != FALSE)
+                    break
+            else:
+                assert False, 'unreachable'
+        return names
+
+
+def symbolic_search(task):
+    """
+    Bidirectional symbolic uniform-cost search.
+    The direction with the smaller next bucket is expanded in every step,
+    the search ends once no path cheaper than the best found one can exist.
+    :param task: the symbolic task
+    :return: the found optimal plan as the list of operator names and its cost
+    """
+    bdd = task.bdd
+    forward = SearchDirection(task, task.initial, True)
+    backward = SearchDirection(task, task.goal, False)
+    best_cost = float('inf')
+    meeting = None
+
+    while forward.open and backward.open:
+        if forward.min_g() + backward.min_g() >= best_cost:
+            break
+
+        if forward.next_size() <= backward.next_size():
+            direction, other = forward, backward
+        else:
+            direction, other = backward, forward
+
+        g, layers, generated = direction.expand()
+        candidates = [(g, k, layer) for k, layer in enumerate(layers)]
+        candidates += [(g_new, 0, states) for g_new, states in generated]
+        for g_direction, k_direction, states in candidates:
+            found = other.find_cheapest(states)
+            if found is None:
+                continue
+            g_other, k_other, common = found
+            if g_direction + g_other < best_cost:
+                best_cost = g_direction + g_other
+                meeting = (direction, g_direction, k_direction, other, g_other, k_other, common)
+
+    if meeting is None:
+        return [], -1
+
+    direction, g_direction, k_direction, other, g_other, k_other, common = meeting
+    state, values = task.pick_state(common)
+    direction_names = direction.trace(state, g_direction, k_direction)
+    other_names = other.trace(state, g_other, k_other)
+    if direction.forward:
+        return direction_names[::-1] + other_names, best_cost
+    return other_names[::-1] + direction_names, best_cost
+
+
+def main(args: argparse.Namespace):
+    input_file = args.input
+    parser = SasParser(input_file)
+    num_variables, initial_values, goal_state, actions = parser.parse()
+    task = SymbolicTask(num_variables, initial_values, goal_state, actions)
+
+    path, total_cost = symbolic_search(task)
+    for action in path:
+        print(action)
+
+    print(f'Plan cost: {total_cost}')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description='Plan an optimal path from the initial state to a goal state using bidirectional symbolic search'
+    )
+    parser.add_argument(
+        '--input', '-i', type=str,
+        help='Path to a file containing the SAS representation of the task',
+        required=True
+    )
+    main(parser.parse_args())
@@ -0,0 +1,33 @@
+from bdd import BDD, FALSE, TRUE
+from symbolic import SymbolicTask, symbolic_search
+
+
+def test_deep_operations():
+    num_vars = 5000
+    bdd = BDD(num_vars)
+    even = bdd.cube((var, True) for var in range(0, num_vars, 2))
+    odd = bdd.cube((var, False) for var in range(1, num_vars, 2))
+
+    both = bdd.apply_and(even, odd)
+    assert bdd.node_count(both) == num_vars + 2
+    assert bdd.apply_or(both, bdd.apply_not(both)) == TRUE
+    assert bdd.apply_diff(both, even) == FALSE
+
+    odd_cube = bdd.cube((var, True) for var in range(1, num_vars, 2))
+    assert bdd.exists(both, odd_cube) == even
+    assert bdd.and_exists(even, odd, odd_cube) == even
+
+    mapping = tuple((var, var + 1) for var in range(0, num_vars, 2))
+    assert bdd.rename(even, mapping) == bdd.cube((var, True) for var in range(1, num_vars, 2))
+
+
+def test_large_symbolic_task():
+    num_variables = 400
+    actions = [(f'op{i}', 1, [], [(i, 4, 0)]) for i in range(4)]
+    actions.append(('last', 0, [], [(num_variables - 1, 4, 0)]))
+    task = SymbolicTask(num_variables, [4] * num_variables, [(0, 0), (1, 0)], actions)
+    assert task.bdd.num_vars == 6 * num_variables
+
+    path, total_cost = symbolic_search(task)
+    assert {'op0', 'op1'} <= set(path) <= {'op0', 'op1', 'last'}
+    assert total_cost == 2
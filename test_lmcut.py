@@ -0,0 +1,66 @@
+import copy
+import os
+
+import pytest
+
+from lmcut import compute_h_lm_cut, compute_h_lm_cut_landmarks
+from planner import SuccessorGenerator
+from sas import SasParser, fdr_to_strips_plus
+from symbolic import SymbolicTask, symbolic_search
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SAS_FILES = [os.path.join(DATA_DIR, name) for name in ['blocks-4-0.sas', 'elevators01.sas', 'sokoban03.sas']]
+
+
+def to_strips_state(state):
+    return {(var_index, value) for var_index, value in enumerate(state)}
+
+
+@pytest.mark.parametrize('file_name', SAS_FILES)
+def test_without_parent_landmarks(file_name):
+    num_variables, initial_values, goal_state, actions = SasParser(file_name).parse()
+    facts, str_actions, s0, g, pre_to_actions = fdr_to_strips_plus(actions, initial_values, goal_state)
+    successor_generator = SuccessorGenerator(num_variables, facts, actions)
+
+    states = [tuple(initial_values)]
+    states += [s1 for a, cost, s1 in successor_generator.get_applicable(tuple(initial_values))]
+    for state in states:
+        s = to_strips_state(state)
+        h_lm_cut, landmarks = compute_h_lm_cut_landmarks(facts, str_actions, s, g, pre_to_actions)
+        assert h_lm_cut == compute_h_lm_cut(facts, str_actions, s, g, pre_to_actions)
+        assert h_lm_cut == sum(m for landmark, m in landmarks)
+
+
+@pytest.mark.parametrize('file_name', SAS_FILES)
+def test_warm_start_is_admissible(file_name):
+    num_variables, initial_values, goal_state, actions = SasParser(file_name).parse()
+    facts, str_actions, s0, g, pre_to_actions = fdr_to_strips_plus(actions, initial_values, goal_state)
+    successor_generator = SuccessorGenerator(num_variables, facts, actions)
+    path, optimal_cost = symbolic_search(SymbolicTask(num_variables, initial_values, goal_state, actions))
+
+    # Along an optimal plan the remaining cost of every state is its perfect heuristic value
+    state = tuple(initial_values)
+    remaining_cost = optimal_cost
+    h_lm_cut, landmarks = compute_h_lm_cut_landmarks(facts, str_actions, to_strips_state(state), g, pre_to_actions)
+    for name in path:
+        a, cost, state = next(applicable for applicable in successor_generator.get_applicable(state)
+                              if applicable[0] == name)
+        remaining_cost -= cost
+        h_lm_cut, landmarks = compute_h_lm_cut_landmarks(
+            facts, str_actions, to_strips_state(state), g, pre_to_actions, landmarks
+        )
+        assert h_lm_cut <= remaining_cost
+    assert remaining_cost == 0
+
+
+def test_dead_end_restores_pre_to_actions():
+    facts = [(0, 0), (0, 1), (1, 0)]
+    actions = [({(0, 1)}, {(1, 0)}, 1)]
+    pre_to_actions = {(0, 0): [], (0, 1): [0], (1, 0): []}
+    original = copy.deepcopy(pre_to_actions)
+
+    h_lm_cut, landmarks = compute_h_lm_cut_landmarks(facts, actions, {(0, 0)}, {(1, 0)}, pre_to_actions)
+    assert h_lm_cut == float('inf')
+    assert landmarks == []
+    # The artificial facts are reset on every call, only the goal action must not be left behind
+    assert {f: pre_to_actions[f] for f in original} == original
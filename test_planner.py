@@ -0,0 +1,116 @@
+import os
+
+import pytest
+
+from hmax import compute_h_max
+from planner import a_star, anytime_a_star, get_weight_schedule, greedy_best_first_search, SuccessorGenerator
+from sas import SasParser, fdr_to_strips_plus
+
+
+def make_graph_task(edges, h_values, goals):
+    successors = {}
+    for s, s1, cost in edges:
+        successors.setdefault(s, []).append((f'{s}_{s1}', cost, s1))
+
+    def is_goal(state):
+        return state in goals
+
+    def get_applicable(state):
+        return successors.get(state, [])
+
+    def h(state):
+        return h_values.get(state, 0)
+
+    return is_goal, get_applicable, h
+
+
+def test_anytime_inconsistent_heuristic():
+    # The heuristic is admissible but not consistent, so s0 -> b -> a is found only after a was expanded
+    edges = [('s0', 'x', 1), ('x', 'g1', 11), ('s0', 'a', 5), ('a', 'e', 1), ('e', 'g2', 7),
+             ('s0', 'b', 1), ('b', 'a', 1)]
+    is_goal, get_applicable, h = make_graph_task(edges, {'b': 9, 'e': 7}, {'g1', 'g2'})
+
+    path, optimal_cost = a_star('s0', is_goal, get_applicable, h)
+    assert optimal_cost == 10
+
+    results = list(anytime_a_star('s0', is_goal, get_applicable, h, [1]))
+    for path, total_cost, bound in results:
+        assert total_cost <= bound * optimal_cost
+    path, total_cost, bound = results[-1]
+    assert path == ['s0_b', 'b_a', 'a_e', 'e_g2']
+    assert total_cost == 10
+    assert bound == 1
+
+
+def test_weight_schedule():
+    assert get_weight_schedule(5, 1) == [5, 4, 3, 2, 1]
+    assert get_weight_schedule(1, 0.5) == [1]
+    weights = get_weight_schedule(2, 0.1)
+    assert len(weights) == 11
+    assert weights[-2] > 1.05
+    assert weights[-1] == 1
+
+
+def make_sas_task(file_name):
+    num_variables, initial_values, goal_state, actions = SasParser(file_name).parse()
+    facts, str_actions, str_initial_state, str_goal_state, pre_to_actions = fdr_to_strips_plus(
+        actions, initial_values, goal_state
+    )
+    successor_generator = SuccessorGenerator(num_variables, facts, actions)
+
+    def is_goal(state):
+        return all(state[var_index] == value for var_index, value in goal_state)
+
+    def h(state):
+        s = {(var_index, value) for var_index, value in enumerate(state)}
+        return compute_h_max(facts, str_actions, s, str_goal_state, pre_to_actions)
+
+    def plan_cost(path):
+        costs = {name: cost for name, cost, prevailing, effect in actions}
+        state = tuple(initial_values)
+        for name in path:
+            state = next(s1 for a, cost, s1 in successor_generator.get_applicable(state) if a == name)
+        assert is_goal(state)
+        return sum(costs[name] for name in path)
+
+    return tuple(initial_values), is_goal, successor_generator.get_applicable, h, plan_cost
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SAS_FILES = [os.path.join(DATA_DIR, name) for name in ['blocks-4-0.sas', 'sokoban03.sas']]
+
+
+@pytest.mark.parametrize('file_name', SAS_FILES)
+def test_weighted_a_star(file_name):
+    s0, is_goal, get_applicable, h, plan_cost = make_sas_task(file_name)
+    path, optimal_cost = a_star(s0, is_goal, get_applicable, h)
+    for weight in [1.5, 3]:
+        path, total_cost = a_star(s0, is_goal, get_applicable, h, weight)
+        assert plan_cost(path) == total_cost
+        assert optimal_cost <= total_cost <= weight * optimal_cost
+
+
+@pytest.mark.parametrize('file_name', SAS_FILES)
+def test_greedy_best_first_search(file_name):
+    s0, is_goal, get_applicable, h, plan_cost = make_sas_task(file_name)
+    path, optimal_cost = a_star(s0, is_goal, get_applicable, h)
+    path, total_cost = greedy_best_first_search(s0, is_goal, get_applicable, h)
+    assert plan_cost(path) == total_cost
+    assert total_cost >= optimal_cost
+
+
+@pytest.mark.parametrize('file_name', SAS_FILES)
+def test_anytime_a_star(file_name):
+    s0, is_goal, get_applicable, h, plan_cost = make_sas_task(file_name)
+    path, optimal_cost = a_star(s0, is_goal, get_applicable, h)
+    results = list(anytime_a_star(s0, is_goal, get_applicable, h, get_weight_schedule(5, 1)))
+    assert results
+    previous_cost = previous_bound = float('inf')
+    for path, total_cost, bound in results:
+        assert plan_cost(path) == total_cost
+        assert total_cost <= bound * optimal_cost
+        assert total_cost <= previous_cost
+        assert bound <= previous_bound
+        previous_cost, previous_bound = total_cost, bound
+    assert previous_cost == optimal_cost
+    assert previous_bound == 1